@@ -1,10 +1,16 @@
 """API routes for the SyncFlow dashboard."""
 
-from fastapi import APIRouter, HTTPException
+import functools
+import uuid
+from typing import Any, Awaitable, Callable
+
+import orjson
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
 
 from src.config import settings
-from src.services.sync import sync_service, SyncStatus
+from src.services.state import sync_state
+from src.services.sync import sync_service
 
 router = APIRouter(prefix="/api")
 
@@ -22,49 +28,111 @@ class ConfigUpdate(BaseModel):
     conflict_strategy: str | None = None
 
 
-@router.get("/status")
-async def get_status() -> SyncResponse:
-    """Get the current sync status."""
-    last_result = sync_service.last_result
+# Distinguishes ETags issued by this process from those of a previous run
+_etag_prefix = uuid.uuid4().hex[:8]
 
-    if last_result is None:
-        return SyncResponse(
-            status="idle",
-            message="No sync has been run yet",
-            data=None,
-        )
+# Rendered JSON bodies keyed by endpoint, tagged with the sync version at render time
+_body_cache: dict[str, tuple[str, bytes]] = {}
 
-    return SyncResponse(
-        status=last_result.status.value,
-        message=f"Last sync: {last_result.status.value}",
-        data=last_result.to_dict(),
+
+async def _current_version() -> str:
+    """Token that changes whenever a sync completes."""
+    if sync_state.enabled:
+        # The shared epoch and counter survive worker restarts and match on every worker
+        return await sync_state.version()
+    return f"{_etag_prefix}-{sync_service.version}"
+
+
+async def _last_result() -> dict[str, Any] | None:
+    if sync_state.enabled:
+        return await sync_state.last_result()
+    last_result = sync_service.last_result
+    return last_result.to_dict() if last_result else None
+
+
+async def _history() -> list[dict[str, Any]]:
+    if sync_state.enabled:
+        return await sync_state.history()
+    return sync_service.history
+
+
+async def _cached_json(
+    key: str, request: Request, render: Callable[[], Awaitable[dict[str, Any]]]
+) -> Response:
+    """Serve a JSON body that only changes when a new sync completes.
+
+    Clients polling with the ETag from their last response get an empty
+    304 until the next sync finishes.
+    """
+    version = await _current_version()
+    etag = f'W/"{version}"'
+    # no-cache makes browsers revalidate every poll rather than guess freshness
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    cached = _body_cache.get(key)
+    if cached is None or cached[0] != version:
+        cached = (version, orjson.dumps(await render()))
+        _body_cache[key] = cached
+    return Response(
+        content=cached[1],
+        media_type="application/json",
+        headers=headers,
     )
 
 
-@router.get("/history")
-async def get_history() -> SyncResponse:
+@router.get("/status", response_model=SyncResponse)
+async def get_status(request: Request) -> Response:
+    """Get the current sync status."""
+    async def render() -> dict[str, Any]:
+        last_result = await _last_result()
+
+        if last_result is None:
+            return {
+                "status": "idle",
+                "message": "No sync has been run yet",
+                "data": None,
+            }
+
+        return {
+            "status": last_result["status"],
+            "message": f"Last sync: {last_result['status']}",
+            "data": last_result,
+        }
+
+    return await _cached_json("status", request, render)
+
+
+@router.get("/history", response_model=SyncResponse)
+async def get_history(request: Request) -> Response:
     """Get sync history."""
-    history = sync_service.history
+    async def render() -> dict[str, Any]:
+        history = await _history()
 
-    return SyncResponse(
-        status="success",
-        message=f"Retrieved {len(history)} sync records",
-        data={"history": history},
-    )
+        return {
+            "status": "success",
+            "message": f"Retrieved {len(history)} sync records",
+            "data": {"history": history},
+        }
+
+    return await _cached_json("history", request, render)
 
 
 @router.post("/sync")
 async def trigger_sync() -> SyncResponse:
     """Trigger a manual sync."""
-    # Check if sync is already running
-    if (sync_service.last_result and
-        sync_service.last_result.status == SyncStatus.RUNNING):
+    # Reject instead of queueing if a sync is already running on any worker
+    if not await sync_state.acquire_run_lock():
         raise HTTPException(
             status_code=409,
             detail="A sync is already in progress"
         )
 
-    result = sync_service.run_sync()
+    try:
+        result = await sync_service.run_sync_async()
+    finally:
+        await sync_state.release_run_lock()
 
     return SyncResponse(
         status=result.status.value,
@@ -73,20 +141,29 @@ async def trigger_sync() -> SyncResponse:
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _config_payload() -> dict[str, Any]:
+    """Non-sensitive settings; computed once since settings are immutable.
+
+    Call ``_config_payload.cache_clear()`` if config updates are ever persisted.
+    """
+    return {
+        "demo_mode": settings.demo_mode,
+        "sync_schedule": settings.sync_schedule,
+        "conflict_strategy": settings.conflict_strategy,
+        "sf_configured": bool(settings.sf_username),
+        "jira_configured": bool(settings.jira_url),
+        "sheets_configured": bool(settings.google_spreadsheet_id),
+    }
+
+
 @router.get("/config")
 async def get_config() -> SyncResponse:
     """Get current configuration (non-sensitive)."""
     return SyncResponse(
         status="success",
         message="Configuration retrieved",
-        data={
-            "demo_mode": settings.demo_mode,
-            "sync_schedule": settings.sync_schedule,
-            "conflict_strategy": settings.conflict_strategy,
-            "sf_configured": bool(settings.sf_username),
-            "jira_configured": bool(settings.jira_url),
-            "sheets_configured": bool(settings.google_spreadsheet_id),
-        },
+        data=_config_payload(),
     )
 
 
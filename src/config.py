@@ -1,5 +1,6 @@
 """Application configuration using pydantic-settings."""
 
+from dataclasses import make_dataclass
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from typing import Literal
@@ -11,6 +12,10 @@ class Settings(BaseSettings):
     # App Settings
     demo_mode: bool = Field(default=False, description="Run with mock data")
     debug: bool = Field(default=False, description="Enable debug logging")
+    web_concurrency: int = Field(
+        default=1,
+        description="Uvicorn worker processes; set redis_url to share sync state"
+    )
 
     # Salesforce
     sf_username: str = Field(default="", description="Salesforce username")
@@ -36,15 +41,40 @@ class Settings(BaseSettings):
     google_spreadsheet_id: str = Field(default="")
     google_sheet_name: str = Field(default="Master Data")
 
+    # Connections
+    client_ttl_seconds: int = Field(
+        default=1800,
+        description="Reuse an authenticated API client for this long after its last use"
+    )
+
+    # Shared state
+    redis_url: str = Field(default="", description="Redis URL for sync state shared across workers")
+
     # Sync Schedule
     sync_schedule: str = Field(default="0 7 * * *", description="Cron schedule")
 
     # Email
     smtp_host: str = Field(default="smtp.gmail.com")
     smtp_port: int = Field(default=587)
+    smtp_tls_mode: Literal["starttls", "implicit"] = Field(
+        default="starttls",
+        description="STARTTLS upgrade, or implicit TLS from connect (always used on port 465)"
+    )
     smtp_user: str = Field(default="")
     smtp_password: str = Field(default="")
+    smtp_auth: Literal["auto", "plain"] = Field(
+        default="auto",
+        description="auto negotiates a mechanism; plain sends AUTH PLAIN directly"
+    )
+    smtp_strict: bool = Field(
+        default=False,
+        description="Build messages with the email package instead of pre-encoded MIME"
+    )
     notify_email: str = Field(default="")
+    notify_format: Literal["html", "text", "both"] = Field(
+        default="both",
+        description="Body parts to include in notification emails"
+    )
 
     # Conflict Resolution
     conflict_strategy: Literal["salesforce_wins", "jira_wins", "most_recent", "manual"] = Field(
@@ -56,4 +86,14 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-settings = Settings()
+# Settings never change after startup, so parse the environment once and serve
+# reads from a frozen, slotted dataclass instead of the pydantic model
+RuntimeSettings = make_dataclass(
+    "RuntimeSettings",
+    [(name, info.annotation) for name, info in Settings.model_fields.items()],
+    namespace={"__doc__": "Immutable snapshot of Settings used at runtime."},
+    frozen=True,
+    slots=True,
+)
+
+settings = RuntimeSettings(**Settings().model_dump())
@@ -2,17 +2,21 @@
 
 import logging
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from pathlib import Path
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from src.api.routes import router as api_router
 from src.config import settings
+from src.services.http import close_client
+from src.services.sheets import sheets_service
+from src.services.state import sync_state
 from src.services.sync import sync_service
 from src.utils.email import send_sync_notification
 
@@ -29,8 +33,25 @@ scheduler = AsyncIOScheduler()
 
 async def scheduled_sync():
     """Run sync on schedule and send notification."""
+    # Every worker runs the scheduler; only the first to claim this fire syncs.
+    # Cron fires on whole minutes and APScheduler drops runs later than its
+    # one-second misfire grace, so the minute identifies the fire.
+    fire_time = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    if not await sync_state.claim_scheduled_run(fire_time):
+        logger.info("Skipping scheduled sync: another worker already ran it")
+        return
+
+    if not await sync_state.acquire_run_lock():
+        logger.info("Skipping scheduled sync: a sync is already in progress")
+        return
+
     logger.info("Running scheduled sync...")
-    result = sync_service.run_sync()
+    try:
+        result = await sync_service.run_sync_async()
+    finally:
+        await sync_state.release_run_lock()
+    # Only queues the email; the sender thread does the SMTP work, so the
+    # event loop is free as soon as the sync itself finishes
     send_sync_notification(result)
 
 
@@ -40,6 +61,8 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting SyncFlow...")
     logger.info(f"Demo mode: {settings.demo_mode}")
+    await sync_state.connect()
+    sheets_service.start_batcher()
 
     # Parse cron schedule and start scheduler
     try:
@@ -63,6 +86,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down SyncFlow...")
     scheduler.shutdown(wait=False)
+    await sheets_service.stop_batcher()
+    await close_client()
+    await sync_state.close()
 
 
 # Create FastAPI app
@@ -71,6 +97,7 @@ app = FastAPI(
     description="Automated Salesforce + Jira to Google Sheets sync",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Include API routes
@@ -108,4 +135,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        # The reloader only supports a single worker
+        workers=1 if settings.debug else settings.web_concurrency,
     )
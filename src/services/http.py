@@ -0,0 +1,35 @@
+"""Shared HTTP connection pool for outbound API calls."""
+
+import asyncio
+import weakref
+
+import httpx
+
+LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+
+# Pooled connections belong to the loop that opened them, so each loop gets its own
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the pooled client for the running event loop.
+
+    Each loop (the API server's, each ``run_sync()``) has its own pool, so
+    loops never share or close each other's connections. Callers that own a
+    short-lived loop should ``close_client()`` before it ends, since a pool
+    cannot be closed once its loop is gone.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(http2=True, timeout=30.0, limits=LIMITS)
+    return client
+
+
+async def close_client() -> None:
+    """Close the running loop's pooled client, leaving other loops' pools open."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
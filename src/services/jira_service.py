@@ -1,16 +1,20 @@
 """Jira API integration."""
 
 import logging
+import time
 from datetime import datetime
 from typing import Any
 
-from jira import JIRA
-from jira.exceptions import JIRAError
+import httpx
 
 from src.config import settings
+from src.services.http import get_client
 
 logger = logging.getLogger(__name__)
 
+# Fields requested for each issue; the REST API returns the key regardless
+ISSUE_FIELDS = ["summary", "status", "assignee", "priority", "created", "updated"]
+
 
 # Mock data for demo mode
 MOCK_ISSUES = [
@@ -63,79 +67,110 @@ MOCK_ISSUES = [
 
 
 class JiraService:
-    """Service for interacting with Jira API."""
+    """Service for interacting with the Jira REST API."""
 
     def __init__(self):
-        self._client: JIRA | None = None
-
-    def connect(self) -> bool:
-        """Establish connection to Jira."""
+        self._base_url: str | None = None
+        self._auth: httpx.BasicAuth | None = None
+        self._last_used = 0.0
+
+    def _session_is_fresh(self) -> bool:
+        """Whether the verified credentials were used recently enough to reuse."""
+        return (
+            self._auth is not None
+            and time.monotonic() - self._last_used < settings.client_ttl_seconds
+        )
+
+    async def connect(self) -> bool:
+        """Establish connection to Jira, reusing recently verified credentials."""
         if settings.demo_mode:
             logger.info("Demo mode: Using mock Jira data")
             return True
 
+        if self._session_is_fresh():
+            return True
+
+        base_url = settings.jira_url.rstrip("/")
+        auth = httpx.BasicAuth(settings.jira_email, settings.jira_api_token)
         try:
-            self._client = JIRA(
-                server=settings.jira_url,
-                basic_auth=(settings.jira_email, settings.jira_api_token),
-            )
             # Test connection
-            self._client.myself()
-            logger.info("Connected to Jira successfully")
-            return True
-        except JIRAError as e:
+            response = await get_client().get(f"{base_url}/rest/api/3/myself", auth=auth)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
             logger.error(f"Jira authentication failed: {e}")
             return False
         except Exception as e:
             logger.error(f"Failed to connect to Jira: {e}")
             return False
 
-    def fetch_issues(self) -> list[dict[str, Any]]:
+        self._base_url = base_url
+        self._auth = auth
+        self._last_used = time.monotonic()
+        logger.info("Connected to Jira successfully")
+        return True
+
+    async def fetch_issues(self) -> list[dict[str, Any]]:
         """Fetch issues using configured JQL query."""
         if settings.demo_mode:
             logger.info(f"Demo mode: Returning {len(MOCK_ISSUES)} mock issues")
             return MOCK_ISSUES
 
-        if not self._client:
+        if not self._auth:
             raise RuntimeError("Not connected to Jira. Call connect() first.")
 
         try:
-            issues = self._client.search_issues(
-                settings.jira_jql,
-                maxResults=100,
-                fields="key,summary,status,assignee,priority,created,updated",
+            response = await get_client().post(
+                f"{self._base_url}/rest/api/3/search/jql",
+                auth=self._auth,
+                json={
+                    "jql": settings.jira_jql,
+                    "fields": ISSUE_FIELDS,
+                    "maxResults": 100,
+                },
             )
+            response.raise_for_status()
 
             results = []
-            for issue in issues:
+            for issue in response.json().get("issues", []):
+                fields = issue["fields"]
+                assignee = fields.get("assignee")
+                priority = fields.get("priority")
                 results.append({
-                    "key": issue.key,
-                    "summary": issue.fields.summary,
-                    "status": str(issue.fields.status),
-                    "assignee": str(issue.fields.assignee) if issue.fields.assignee else "Unassigned",
-                    "priority": str(issue.fields.priority) if issue.fields.priority else "None",
-                    "created": issue.fields.created[:10],
-                    "updated": issue.fields.updated[:10],
+                    "key": issue["key"],
+                    "summary": fields["summary"],
+                    "status": fields["status"]["name"],
+                    "assignee": assignee["displayName"] if assignee else "Unassigned",
+                    "priority": priority["name"] if priority else "None",
+                    "created": fields["created"][:10],
+                    "updated": fields["updated"][:10],
                 })
 
+            self._last_used = time.monotonic()
             logger.info(f"Fetched {len(results)} issues from Jira")
             return results
         except Exception as e:
             logger.error(f"Failed to fetch issues: {e}")
+            # Re-verify credentials on the next connect()
+            self._last_used = 0.0
             raise
 
-    def get_last_modified(self, issue_key: str) -> datetime | None:
+    async def get_last_modified(self, issue_key: str) -> datetime | None:
         """Get the last modified timestamp for an issue."""
         if settings.demo_mode:
             return datetime.now()
 
-        if not self._client:
+        if not self._auth:
             return None
 
         try:
-            issue = self._client.issue(issue_key, fields="updated")
+            response = await get_client().get(
+                f"{self._base_url}/rest/api/3/issue/{issue_key}",
+                auth=self._auth,
+                params={"fields": "updated"},
+            )
+            response.raise_for_status()
             return datetime.fromisoformat(
-                issue.fields.updated.replace("Z", "+00:00")
+                response.json()["fields"]["updated"].replace("Z", "+00:00")
             )
         except Exception as e:
             logger.warning(f"Could not get last modified date for {issue_key}: {e}")
@@ -1,13 +1,16 @@
 """Salesforce API integration."""
 
 import logging
+import time
 from datetime import datetime
 from typing import Any
 
-from simple_salesforce import Salesforce
+from simple_salesforce import SalesforceLogin, format_soql
+from simple_salesforce.api import DEFAULT_API_VERSION
 from simple_salesforce.exceptions import SalesforceAuthenticationFailed
 
 from src.config import settings
+from src.services.http import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -56,21 +59,38 @@ class SalesforceService:
     """Service for interacting with Salesforce API."""
 
     def __init__(self):
-        self._client: Salesforce | None = None
+        self._base_url: str | None = None
+        self._headers: dict[str, str] = {}
+        self._last_used = 0.0
+
+    def _session_is_fresh(self) -> bool:
+        """Whether the cached session was used recently enough to reuse."""
+        return (
+            self._base_url is not None
+            and time.monotonic() - self._last_used < settings.client_ttl_seconds
+        )
 
     def connect(self) -> bool:
-        """Establish connection to Salesforce."""
+        """Log in to Salesforce, reusing a recent session."""
         if settings.demo_mode:
             logger.info("Demo mode: Using mock Salesforce data")
             return True
 
+        if self._session_is_fresh():
+            return True
+
         try:
-            self._client = Salesforce(
+            # Only the login goes through simple_salesforce; queries use the
+            # shared HTTP pool with the resulting session id
+            session_id, instance = SalesforceLogin(
                 username=settings.sf_username,
                 password=settings.sf_password,
                 security_token=settings.sf_security_token,
                 domain=settings.sf_domain,
             )
+            self._base_url = f"https://{instance}/services/data/v{DEFAULT_API_VERSION}"
+            self._headers = {"Authorization": f"Bearer {session_id}"}
+            self._last_used = time.monotonic()
             logger.info("Connected to Salesforce successfully")
             return True
         except SalesforceAuthenticationFailed as e:
@@ -80,43 +100,55 @@ class SalesforceService:
             logger.error(f"Failed to connect to Salesforce: {e}")
             return False
 
-    def fetch_opportunities(self) -> list[dict[str, Any]]:
+    async def _query(self, soql: str) -> dict[str, Any]:
+        """Run a SOQL query through the REST API."""
+        response = await get_client().get(
+            f"{self._base_url}/query",
+            params={"q": soql},
+            headers=self._headers,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_opportunities(self) -> list[dict[str, Any]]:
         """Fetch opportunities using configured SOQL query."""
         if settings.demo_mode:
             logger.info(f"Demo mode: Returning {len(MOCK_OPPORTUNITIES)} mock opportunities")
             return MOCK_OPPORTUNITIES
 
-        if not self._client:
+        if not self._base_url:
             raise RuntimeError("Not connected to Salesforce. Call connect() first.")
 
         try:
-            result = self._client.query(settings.sf_query)
+            result = await self._query(settings.sf_query)
             records = result.get("records", [])
 
-            # Remove Salesforce metadata from records
-            cleaned = []
+            # Remove Salesforce metadata from records; they are freshly
+            # decoded from the response, so strip it in place
             for record in records:
-                clean_record = {k: v for k, v in record.items() if k != "attributes"}
-                cleaned.append(clean_record)
+                record.pop("attributes", None)
 
-            logger.info(f"Fetched {len(cleaned)} opportunities from Salesforce")
-            return cleaned
+            self._last_used = time.monotonic()
+            logger.info(f"Fetched {len(records)} opportunities from Salesforce")
+            return records
         except Exception as e:
             logger.error(f"Failed to fetch opportunities: {e}")
+            # The session may have expired; log in again on the next connect()
+            self._last_used = 0.0
             raise
 
-    def get_last_modified(self, record_id: str) -> datetime | None:
+    async def get_last_modified(self, record_id: str) -> datetime | None:
         """Get the last modified timestamp for a record."""
         if settings.demo_mode:
             return datetime.now()
 
-        if not self._client:
+        if not self._base_url:
             return None
 
         try:
-            result = self._client.query(
-                f"SELECT LastModifiedDate FROM Opportunity WHERE Id = '{record_id}'"
-            )
+            result = await self._query(format_soql(
+                "SELECT LastModifiedDate FROM Opportunity WHERE Id = {}", record_id
+            ))
             if result.get("records"):
                 return datetime.fromisoformat(
                     result["records"][0]["LastModifiedDate"].replace("Z", "+00:00")
@@ -1,7 +1,12 @@
 """Google Sheets API integration."""
 
+import asyncio
 import logging
-from typing import Any
+import re
+import threading
+import time
+from datetime import date
+from typing import Any, Callable
 
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
@@ -13,25 +18,178 @@ logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
+# Rows per batchUpdate request, to stay under the Sheets API payload limit
+WRITE_CHUNK_ROWS = 10_000
+
+
+# Sheets stores dates as days since this epoch
+_SHEETS_EPOCH = date(1899, 12, 30)
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Cell fields written by appendCells and reset by the clear, so a date format
+# never outlives the value it was applied to
+CELL_FIELDS = "userEnteredValue,userEnteredFormat.numberFormat"
+
+
+def _cell(value: Any) -> dict[str, Any]:
+    """Convert a Python value into a Sheets API CellData payload.
+
+    ISO dates (e.g. Salesforce CloseDate) become date serials, as they would
+    when typed into the sheet, so the column stays sortable as dates.
+    """
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+
+    text = str(value)
+    if text.startswith("="):
+        return {"userEnteredValue": {"formulaValue": text}}
+    if _ISO_DATE.fullmatch(text):
+        try:
+            serial = (date.fromisoformat(text) - _SHEETS_EPOCH).days
+        except ValueError:
+            pass
+        else:
+            return {
+                "userEnteredValue": {"numberValue": serial},
+                "userEnteredFormat": {
+                    "numberFormat": {"type": "DATE", "pattern": "yyyy-mm-dd"},
+                },
+            }
+    return {"userEnteredValue": {"stringValue": text}}
+
+
+class _RowBatcher:
+    """Coalesces single-row appends into one API call per burst.
+
+    Rows are flushed once max_batch have queued or max_wait seconds after the
+    first row of a batch arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[list[Any]]], bool],
+        max_batch: int = 50,
+        max_wait: float = 0.25,
+    ):
+        self._flush = flush
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the background flush task on the running loop."""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Flush queued rows and stop the background task."""
+        if self._task is None:
+            return
+
+        task, self._task = self._task, None
+        await self._queue.put(None)
+        await task
+
+    async def enqueue(self, row: list[Any]) -> bool:
+        """Queue a row and wait for the batch containing it to be written."""
+        if self._task is None:
+            # No batcher running (e.g. outside the app); write directly
+            return await asyncio.to_thread(self._flush, [row])
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                ok = await asyncio.to_thread(self._flush, [row for row, _ in batch])
+            except Exception as e:
+                logger.error(f"Failed to append rows: {e}")
+                ok = False
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(ok)
+
 
 class SheetsService:
     """Service for interacting with Google Sheets API."""
 
     def __init__(self):
         self._service = None
+        # The googleapiclient transport (httplib2) is not thread-safe, and sync
+        # writes and batched appends run on different worker threads
+        self._lock = threading.Lock()
+        self._batcher = _RowBatcher(self._append_rows)
+        self._sheet_id: int | None = None
+        self._last_used = 0.0
+
+    def _service_is_fresh(self) -> bool:
+        """Whether the cached API client was used recently enough to reuse."""
+        return (
+            self._service is not None
+            and time.monotonic() - self._last_used < settings.client_ttl_seconds
+        )
 
     def connect(self) -> bool:
-        """Establish connection to Google Sheets API."""
+        """Establish connection to Google Sheets API, reusing a recent client."""
         if settings.demo_mode:
             logger.info("Demo mode: Simulating Google Sheets connection")
             return True
 
+        # Building the client loads the discovery document, so keep it around
+        if self._service_is_fresh():
+            return True
+
         try:
             creds = Credentials.from_service_account_file(
                 settings.google_credentials_file,
                 scopes=SCOPES,
             )
-            self._service = build("sheets", "v4", credentials=creds)
+            service = build("sheets", "v4", credentials=creds)
+
+            # Look up the numeric sheet id that batchUpdate requests address
+            spreadsheet = service.spreadsheets().get(
+                spreadsheetId=settings.google_spreadsheet_id,
+                fields="sheets.properties(sheetId,title)",
+            ).execute()
+            for sheet in spreadsheet.get("sheets", []):
+                if sheet["properties"]["title"] == settings.google_sheet_name:
+                    self._sheet_id = sheet["properties"]["sheetId"]
+                    break
+            else:
+                logger.error(f"Sheet not found: {settings.google_sheet_name}")
+                return False
+
+            self._service = service
+            self._last_used = time.monotonic()
             logger.info("Connected to Google Sheets API successfully")
             return True
         except FileNotFoundError:
@@ -51,11 +209,11 @@ class SheetsService:
             raise RuntimeError("Not connected to Sheets. Call connect() first.")
 
         try:
-            sheet = self._service.spreadsheets()
-            result = sheet.values().get(
-                spreadsheetId=settings.google_spreadsheet_id,
-                range=f"{settings.google_sheet_name}!{range_name}",
-            ).execute()
+            with self._lock:
+                result = self._service.spreadsheets().values().get(
+                    spreadsheetId=settings.google_spreadsheet_id,
+                    range=f"{settings.google_sheet_name}!{range_name}",
+                ).execute()
 
             values = result.get("values", [])
             logger.info(f"Read {len(values)} rows from sheet")
@@ -64,8 +222,8 @@ class SheetsService:
             logger.error(f"Failed to read sheet: {e}")
             raise
 
-    def write_sheet(self, data: list[list[Any]], start_cell: str = "A1") -> int:
-        """Write data to the configured spreadsheet."""
+    def write_sheet(self, data: list[list[Any]]) -> int:
+        """Replace the contents of the configured sheet with data."""
         if settings.demo_mode:
             logger.info(f"Demo mode: Would write {len(data)} rows to sheet")
             return len(data)
@@ -74,31 +232,54 @@ class SheetsService:
             raise RuntimeError("Not connected to Sheets. Call connect() first.")
 
         try:
-            sheet = self._service.spreadsheets()
+            # Append the rows in chunks after clearing the existing data. The
+            # clear rides along with the first chunk, so typical syncs are a
+            # single round-trip; appendCells adds grid rows as needed.
+            batches = [
+                [{
+                    "appendCells": {
+                        "sheetId": self._sheet_id,
+                        "rows": [
+                            {"values": [_cell(v) for v in row]}
+                            for row in data[start:start + WRITE_CHUNK_ROWS]
+                        ],
+                        "fields": CELL_FIELDS,
+                    },
+                }]
+                for start in range(0, len(data), WRITE_CHUNK_ROWS)
+            ] or [[]]
+            batches[0].insert(0, {
+                "updateCells": {
+                    "range": {"sheetId": self._sheet_id},
+                    "fields": CELL_FIELDS,
+                },
+            })
 
-            # Clear existing data first
-            sheet.values().clear(
-                spreadsheetId=settings.google_spreadsheet_id,
-                range=f"{settings.google_sheet_name}!A:Z",
-            ).execute()
+            # Each chunk appends after the previous one, so send them in order
+            with self._lock:
+                for requests in batches:
+                    self._service.spreadsheets().batchUpdate(
+                        spreadsheetId=settings.google_spreadsheet_id,
+                        body={"requests": requests},
+                    ).execute()
 
-            # Write new data
-            result = sheet.values().update(
-                spreadsheetId=settings.google_spreadsheet_id,
-                range=f"{settings.google_sheet_name}!{start_cell}",
-                valueInputOption="USER_ENTERED",
-                body={"values": data},
-            ).execute()
-
-            updated_rows = result.get("updatedRows", 0)
-            logger.info(f"Wrote {updated_rows} rows to sheet")
-            return updated_rows
+            self._last_used = time.monotonic()
+            logger.info(f"Wrote {len(data)} rows to sheet")
+            return len(data)
         except HttpError as e:
             logger.error(f"Failed to write to sheet: {e}")
             raise
 
-    def append_row(self, row: list[Any]) -> bool:
-        """Append a single row to the sheet."""
+    def start_batcher(self) -> None:
+        """Begin batching append_row calls on the running event loop."""
+        self._batcher.start()
+
+    async def stop_batcher(self) -> None:
+        """Write any queued rows and stop batching."""
+        await self._batcher.stop()
+
+    async def append_row(self, row: list[Any]) -> bool:
+        """Append a single row to the sheet, batched with concurrent appends."""
         if settings.demo_mode:
             logger.info(f"Demo mode: Would append row: {row}")
             return True
@@ -106,18 +287,23 @@ class SheetsService:
         if not self._service:
             raise RuntimeError("Not connected to Sheets. Call connect() first.")
 
+        return await self._batcher.enqueue(row)
+
+    def _append_rows(self, rows: list[list[Any]]) -> bool:
+        """Append rows to the sheet in a single request."""
         try:
-            sheet = self._service.spreadsheets()
-            sheet.values().append(
-                spreadsheetId=settings.google_spreadsheet_id,
-                range=f"{settings.google_sheet_name}!A:A",
-                valueInputOption="USER_ENTERED",
-                insertDataOption="INSERT_ROWS",
-                body={"values": [row]},
-            ).execute()
+            with self._lock:
+                self._service.spreadsheets().values().append(
+                    spreadsheetId=settings.google_spreadsheet_id,
+                    range=f"{settings.google_sheet_name}!A:A",
+                    valueInputOption="USER_ENTERED",
+                    insertDataOption="INSERT_ROWS",
+                    body={"values": rows},
+                ).execute()
+            self._last_used = time.monotonic()
             return True
         except HttpError as e:
-            logger.error(f"Failed to append row: {e}")
+            logger.error(f"Failed to append {len(rows)} rows: {e}")
             return False
 
 
@@ -0,0 +1,151 @@
+"""Sync state shared between Uvicorn workers."""
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Any
+
+import orjson
+from redis.asyncio import Redis
+from redis.asyncio.lock import Lock
+from redis.exceptions import LockError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+LAST_RESULT_KEY = "syncflow:last_result"
+HISTORY_KEY = "syncflow:history"
+VERSION_KEY = "syncflow:version"
+EPOCH_KEY = "syncflow:epoch"
+RUNNING_KEY = "syncflow:running"
+SCHEDULED_KEY_PREFIX = "syncflow:scheduled:"
+
+HISTORY_LIMIT = 50
+# A worker that dies mid-sync releases the guard after this long
+RUNNING_TTL_SECONDS = 3600
+# How long a claimed scheduled run is remembered; well past any misfire grace
+SCHEDULED_CLAIM_TTL_SECONDS = 86400
+
+
+class SyncStateStore:
+    """Publishes sync results and guards against concurrent syncs via Redis.
+
+    Without REDIS_URL the single-flight guard is per process and readers
+    fall back to the worker's own sync_service state.
+    """
+
+    def __init__(self):
+        self._redis: Redis | None = None
+        self._lock: Lock | None = None
+        self._running = False
+        self._last_scheduled: datetime | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._redis is not None
+
+    async def connect(self) -> bool:
+        """Connect to Redis if configured."""
+        if not settings.redis_url:
+            logger.info("Redis not configured, keeping sync state in memory")
+            return False
+
+        try:
+            client = Redis.from_url(settings.redis_url)
+            await client.ping()
+            await _start_epoch(client)
+        except Exception as e:
+            logger.error(f"Failed to connect to Redis: {e}")
+            return False
+
+        self._redis = client
+        logger.info("Connected to Redis successfully")
+        return True
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def acquire_run_lock(self) -> bool:
+        """Claim the right to run a sync; False if one is already running."""
+        if self._redis is None:
+            if self._running:
+                return False
+            self._running = True
+            return True
+
+        lock = self._redis.lock(RUNNING_KEY, timeout=RUNNING_TTL_SECONDS)
+        if not await lock.acquire(blocking=False):
+            return False
+        self._lock = lock
+        return True
+
+    async def release_run_lock(self) -> None:
+        if self._lock is not None:
+            try:
+                await self._lock.release()
+            except LockError:
+                logger.warning("Sync lock expired before the sync finished")
+            self._lock = None
+        self._running = False
+
+    async def claim_scheduled_run(self, fire_time: datetime) -> bool:
+        """Claim a scheduled fire time; False if a worker already ran it.
+
+        Unlike the run lock this is never released, so a worker whose job
+        fires after another worker's sync finished still skips it.
+        """
+        if self._redis is None:
+            if self._last_scheduled == fire_time:
+                return False
+            self._last_scheduled = fire_time
+            return True
+
+        key = SCHEDULED_KEY_PREFIX + fire_time.isoformat()
+        return bool(await self._redis.set(key, 1, nx=True, ex=SCHEDULED_CLAIM_TTL_SECONDS))
+
+    async def publish(self, result: dict[str, Any]) -> None:
+        """Record a completed sync for every worker to serve."""
+        if self._redis is None:
+            return
+
+        payload = orjson.dumps(result)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(LAST_RESULT_KEY, payload)
+            pipe.lpush(HISTORY_KEY, payload)
+            pipe.ltrim(HISTORY_KEY, 0, HISTORY_LIMIT - 1)
+            pipe.incr(VERSION_KEY)
+            await pipe.execute()
+
+    async def version(self) -> str:
+        """Token that changes each time a sync is published.
+
+        The counter is prefixed with a random epoch, so a flushed or restarted
+        Redis that resets the counter cannot repeat a token clients still hold.
+        """
+        epoch, counter = await self._redis.mget(EPOCH_KEY, VERSION_KEY)
+        if epoch is None:
+            # The data was wiped since connect; whichever worker notices starts a new epoch
+            await _start_epoch(self._redis)
+            epoch, counter = await self._redis.mget(EPOCH_KEY, VERSION_KEY)
+        return f"{epoch.decode()}-{int(counter or 0)}"
+
+    async def last_result(self) -> dict[str, Any] | None:
+        payload = await self._redis.get(LAST_RESULT_KEY)
+        return orjson.loads(payload) if payload else None
+
+    async def history(self) -> list[dict[str, Any]]:
+        """Published results, oldest first."""
+        payloads = await self._redis.lrange(HISTORY_KEY, 0, -1)
+        return [orjson.loads(p) for p in reversed(payloads)]
+
+
+async def _start_epoch(client: Redis) -> None:
+    """Set a new random epoch unless another worker already has."""
+    await client.set(EPOCH_KEY, uuid.uuid4().hex[:8], nx=True)
+
+
+# Singleton instance
+sync_state = SyncStateStore()
@@ -1,18 +1,28 @@
 """Main sync orchestration logic."""
 
+import asyncio
 import logging
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
 from src.config import settings
+from src.services.http import close_client
 from src.services.salesforce import salesforce_service
 from src.services.jira_service import jira_service
 from src.services.sheets import sheets_service
+from src.services.state import sync_state
 
 logger = logging.getLogger(__name__)
 
+# Column order of the master sheet
+SHEET_HEADERS = [
+    "Source", "SF ID", "Name", "Amount", "Stage",
+    "Close Date", "Jira Key", "Jira Status", "Assignee", "Last Synced"
+]
+
 
 class SyncStatus(str, Enum):
     """Status of a sync operation."""
@@ -23,7 +33,7 @@ class SyncStatus(str, Enum):
     PARTIAL = "partial"
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncResult:
     """Result of a sync operation."""
     status: SyncStatus
@@ -34,9 +44,15 @@ class SyncResult:
     rows_written: int = 0
     conflicts_resolved: int = 0
     errors: list[str] = field(default_factory=list)
+    _dict_cache: dict[str, Any] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        if self._dict_cache is not None:
+            return self._dict_cache
+
+        data = {
             "status": self.status.value,
             "started_at": self.started_at.isoformat(),
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
@@ -51,66 +67,108 @@ class SyncResult:
             ),
         }
 
+        # A completed result is never modified again, so serialize it only once
+        if self.completed_at is not None:
+            self._dict_cache = data
+
+        return data
+
 
 class SyncService:
     """Orchestrates the sync between Salesforce, Jira, and Google Sheets."""
 
     def __init__(self):
         self._last_result: SyncResult | None = None
-        self._history: list[SyncResult] = []
+        self._history: deque[SyncResult] = deque(maxlen=50)  # Last 50 syncs
+        self._history_dicts: list[dict[str, Any]] | None = None
+        self._version = 0
 
     @property
     def last_result(self) -> SyncResult | None:
         return self._last_result
 
+    @property
+    def version(self) -> int:
+        """Counter bumped each time a sync completes."""
+        return self._version
+
     @property
     def history(self) -> list[dict[str, Any]]:
-        return [r.to_dict() for r in self._history[-50:]]  # Last 50 syncs
+        if self._history_dicts is None:
+            self._history_dicts = [r.to_dict() for r in self._history]
+        return self._history_dicts
 
     def run_sync(self) -> SyncResult:
-        """Execute a full sync operation."""
+        """Execute a full sync operation from synchronous code."""
+        return asyncio.run(self._run_sync_and_close())
+
+    async def _run_sync_and_close(self) -> SyncResult:
+        # The HTTP pool is bound to this short-lived loop; close it before the
+        # loop ends rather than leaking its connections
+        try:
+            return await self.run_sync_async()
+        finally:
+            await close_client()
+
+    async def run_sync_async(self) -> SyncResult:
+        """Execute a full sync operation, overlapping independent API calls."""
         result = SyncResult(
             status=SyncStatus.RUNNING,
             started_at=datetime.now(),
         )
 
         try:
-            # Connect to all services
+            # Connect to all services concurrently
             logger.info("Starting sync operation...")
 
-            if not salesforce_service.connect():
+            sf_connected, jira_connected, sheets_connected = await asyncio.gather(
+                asyncio.to_thread(salesforce_service.connect),
+                jira_service.connect(),
+                asyncio.to_thread(sheets_service.connect),
+                return_exceptions=True,
+            )
+
+            if sf_connected is not True:
                 result.errors.append("Failed to connect to Salesforce")
 
-            if not jira_service.connect():
+            if jira_connected is not True:
                 result.errors.append("Failed to connect to Jira")
 
-            if not sheets_service.connect():
+            if sheets_connected is not True:
                 result.errors.append("Failed to connect to Google Sheets")
 
-            # Fetch data from sources
+            # Fetch data from sources; the two fetches are independent and
+            # share one HTTP connection pool
             opportunities = []
             issues = []
 
-            try:
-                opportunities = salesforce_service.fetch_opportunities()
+            sf_fetched, jira_fetched = await asyncio.gather(
+                salesforce_service.fetch_opportunities(),
+                jira_service.fetch_issues(),
+                return_exceptions=True,
+            )
+
+            if isinstance(sf_fetched, Exception):
+                result.errors.append(f"Salesforce fetch error: {sf_fetched}")
+            else:
+                opportunities = sf_fetched
                 result.salesforce_records = len(opportunities)
-            except Exception as e:
-                result.errors.append(f"Salesforce fetch error: {e}")
 
-            try:
-                issues = jira_service.fetch_issues()
+            if isinstance(jira_fetched, Exception):
+                result.errors.append(f"Jira fetch error: {jira_fetched}")
+            else:
+                issues = jira_fetched
                 result.jira_issues = len(issues)
-            except Exception as e:
-                result.errors.append(f"Jira fetch error: {e}")
 
             # Transform and merge data
             merged_data = self._merge_data(opportunities, issues)
             result.conflicts_resolved = merged_data.get("conflicts", 0)
 
             # Write to sheet
-            sheet_data = self._format_for_sheet(merged_data["rows"])
             try:
-                result.rows_written = sheets_service.write_sheet(sheet_data)
+                result.rows_written = await asyncio.to_thread(
+                    sheets_service.write_sheet, merged_data["rows"]
+                )
             except Exception as e:
                 result.errors.append(f"Sheets write error: {e}")
 
@@ -128,6 +186,13 @@ class SyncService:
         result.completed_at = datetime.now()
         self._last_result = result
         self._history.append(result)
+        self._history_dicts = None
+        self._version += 1
+
+        try:
+            await sync_state.publish(result.to_dict())
+        except Exception as e:
+            logger.error(f"Failed to publish sync result: {e}")
 
         logger.info(
             f"Sync completed: {result.status.value} - "
@@ -143,101 +208,67 @@ class SyncService:
         opportunities: list[dict],
         issues: list[dict]
     ) -> dict[str, Any]:
-        """Merge Salesforce and Jira data with conflict resolution."""
-        rows = []
+        """Merge Salesforce and Jira data into sheet rows with conflict resolution."""
+        rows = [SHEET_HEADERS]
         conflicts = 0
+        # All rows are written in the same pass, so they share one timestamp
+        now_iso = datetime.now().isoformat()
+        strategy = settings.conflict_strategy
 
         # Create a mapping of opportunity names to Jira issues
         # This is a simplified example - real implementation would use
         # configurable matching logic
+        # Index opportunities by case-folded company name once; the first
+        # opportunity wins when several share a company name
+        prefix_to_opp = {}
+        for opp in opportunities:
+            prefix_to_opp.setdefault(opp["Name"].split(" - ", 1)[0].casefold(), opp)
+
         opp_name_to_issue = {}
         for issue in issues:
             # Extract company name from issue summary (simplified)
-            for opp in opportunities:
-                if opp["Name"].split(" - ")[0].lower() in issue["summary"].lower():
+            summary = issue["summary"].casefold()
+            for prefix, opp in prefix_to_opp.items():
+                if prefix in summary:
                     opp_name_to_issue[opp["Id"]] = issue
                     break
 
         for opp in opportunities:
-            row = {
-                "source": "Combined",
-                "sf_id": opp["Id"],
-                "name": opp["Name"],
-                "amount": opp.get("Amount", 0),
-                "stage": opp.get("StageName", ""),
-                "close_date": opp.get("CloseDate", ""),
-                "jira_key": "",
-                "jira_status": "",
-                "jira_assignee": "",
-                "last_updated": datetime.now().isoformat(),
-            }
+            stage = opp.get("StageName", "")
+            jira_key = jira_status = jira_assignee = ""
 
             # Merge Jira data if available
-            if opp["Id"] in opp_name_to_issue:
-                issue = opp_name_to_issue[opp["Id"]]
-                row["jira_key"] = issue["key"]
-                row["jira_status"] = issue["status"]
-                row["jira_assignee"] = issue["assignee"]
+            issue = opp_name_to_issue.get(opp["Id"])
+            if issue is not None:
+                jira_key = issue["key"]
+                jira_status = issue["status"]
+                jira_assignee = issue["assignee"]
 
                 # Check for conflicts (e.g., status mismatch)
-                if (opp.get("StageName") == "Closed Won" and
-                    issue["status"] != "Done"):
+                if stage == "Closed Won" and jira_status != "Done":
                     conflicts += 1
                     # Apply conflict resolution strategy
-                    if settings.conflict_strategy == "salesforce_wins":
+                    if strategy == "salesforce_wins":
                         pass  # Keep SF data as-is
-                    elif settings.conflict_strategy == "jira_wins":
-                        row["stage"] = issue["status"]
+                    elif strategy == "jira_wins":
+                        stage = jira_status
 
-            rows.append(row)
+            rows.append([
+                "Combined", opp["Id"], opp["Name"], opp.get("Amount", 0), stage,
+                opp.get("CloseDate", ""), jira_key, jira_status, jira_assignee, now_iso,
+            ])
 
         # Add Jira issues that don't match any opportunity
-        matched_keys = {opp_name_to_issue.get(o["Id"], {}).get("key") for o in opportunities}
+        matched_keys = {issue["key"] for issue in opp_name_to_issue.values()}
         for issue in issues:
             if issue["key"] not in matched_keys:
-                rows.append({
-                    "source": "Jira Only",
-                    "sf_id": "",
-                    "name": issue["summary"],
-                    "amount": 0,
-                    "stage": "",
-                    "close_date": "",
-                    "jira_key": issue["key"],
-                    "jira_status": issue["status"],
-                    "jira_assignee": issue["assignee"],
-                    "last_updated": datetime.now().isoformat(),
-                })
-
-        return {"rows": rows, "conflicts": conflicts}
-
-    def _format_for_sheet(self, rows: list[dict]) -> list[list[Any]]:
-        """Format merged data for Google Sheets."""
-        if not rows:
-            return []
-
-        # Header row
-        headers = [
-            "Source", "SF ID", "Name", "Amount", "Stage",
-            "Close Date", "Jira Key", "Jira Status", "Assignee", "Last Synced"
-        ]
-
-        # Data rows
-        sheet_rows = [headers]
-        for row in rows:
-            sheet_rows.append([
-                row.get("source", ""),
-                row.get("sf_id", ""),
-                row.get("name", ""),
-                row.get("amount", 0),
-                row.get("stage", ""),
-                row.get("close_date", ""),
-                row.get("jira_key", ""),
-                row.get("jira_status", ""),
-                row.get("jira_assignee", ""),
-                row.get("last_updated", ""),
-            ])
+                rows.append([
+                    "Jira Only", "", issue["summary"], 0, "",
+                    "", issue["key"], issue["status"], issue["assignee"], now_iso,
+                ])
 
-        return sheet_rows
+        # Leave the sheet empty rather than writing a lone header row
+        return {"rows": rows if len(rows) > 1 else [], "conflicts": conflicts}
 
 
 # Singleton instance
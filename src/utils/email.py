@@ -1,65 +1,111 @@
 """Email notification utilities."""
 
+import atexit
+import base64
+import functools
+import html as html_lib
+import importlib.util
 import logging
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import queue
+import sys
+import threading
+import time
+from email import policy
+from email.message import EmailMessage
+from email.utils import formatdate
+from types import ModuleType
 
 from src.config import settings
 from src.services.sync import SyncResult, SyncStatus
 
+
+def _lazy_import(name: str) -> ModuleType:
+    """Import a module on first attribute access instead of at startup."""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Most processes (demo mode, no recipient configured) never send mail, so the
+# SMTP client is only loaded once a connection is actually opened
+smtplib = _lazy_import("smtplib")
+
 logger = logging.getLogger(__name__)
 
+# Close a cached SMTP connection that has been idle for longer than this
+SMTP_IDLE_TIMEOUT_SECONDS = 100
 
-def send_sync_notification(result: SyncResult) -> bool:
-    """Send email notification about sync result."""
-    if not settings.notify_email or not settings.smtp_user:
-        logger.info("Email notifications not configured, skipping")
-        return False
+# Socket timeout for SMTP commands, so a silently dropped connection fails fast
+SMTP_TIMEOUT_SECONDS = 30
 
-    if settings.demo_mode:
-        logger.info(f"Demo mode: Would send email to {settings.notify_email}")
-        return True
 
-    try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = f"SyncFlow: {result.status.value.upper()}"
-        msg["From"] = settings.smtp_user
-        msg["To"] = settings.notify_email
+@functools.cache
+def _ssl_context():
+    """TLS context shared by every connection; loading the trust store is slow."""
+    import ssl
+
+    return ssl.create_default_context()
+
 
-        # Plain text version
-        text = f"""
+def _implicit_tls(port: int) -> bool:
+    """Whether to connect with TLS from the start rather than upgrade via STARTTLS."""
+    return settings.smtp_tls_mode == "implicit" or port == 465
+
+
+def _login(server, user: str, password: str) -> None:
+    """Authenticate, sending AUTH PLAIN directly when smtp_auth is "plain"."""
+    if settings.smtp_auth == "plain":
+        server.ehlo_or_helo_if_needed()
+        token = base64.b64encode(f"\0{user}\0{password}".encode()).decode("ascii")
+        code, resp = server.docmd("AUTH PLAIN", token)
+        if code == 235:
+            return
+        if code == 535:
+            raise smtplib.SMTPAuthenticationError(code, resp)
+        # Mechanism not accepted; let smtplib negotiate one instead
+
+    server.login(user, password)
+
+
+# Timestamp format used in notification bodies
+_FMT = "%Y-%m-%d %H:%M:%S"
+
+# Message templates, built once and filled in with str.format_map per send
+_UPPER_STATUS = {status: status.value.upper() for status in SyncStatus}
+_SUBJECTS = {status: f"SyncFlow: {label}" for status, label in _UPPER_STATUS.items()}
+
+_TEXT_TEMPLATE = """
 SyncFlow Sync Report
 ====================
 
-Status: {result.status.value.upper()}
-Started: {result.started_at.strftime('%Y-%m-%d %H:%M:%S')}
-Completed: {result.completed_at.strftime('%Y-%m-%d %H:%M:%S') if result.completed_at else 'N/A'}
+Status: {status}
+Started: {started_at}
+Completed: {completed_at}
 
 Results:
-- Salesforce records: {result.salesforce_records}
-- Jira issues: {result.jira_issues}
-- Rows written: {result.rows_written}
-- Conflicts resolved: {result.conflicts_resolved}
+- Salesforce records: {salesforce_records}
+- Jira issues: {jira_issues}
+- Rows written: {rows_written}
+- Conflicts resolved: {conflicts_resolved}
 
-{f'Errors: {chr(10).join(result.errors)}' if result.errors else 'No errors'}
+{errors_text}
 """
 
-        # HTML version
-        status_color = {
-            SyncStatus.SUCCESS: "#22c55e",
-            SyncStatus.PARTIAL: "#f59e0b",
-            SyncStatus.FAILED: "#ef4444",
-        }.get(result.status, "#6b7280")
-
-        html = f"""
+_HTML_BASE = """
 <!DOCTYPE html>
 <html>
 <head>
     <style>
         body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; }}
         .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-        .header {{ background: {status_color}; color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
+        .header {{ background: __STATUS_COLOR__; color: white; padding: 20px; border-radius: 8px 8px 0 0; }}
         .content {{ background: #f9fafb; padding: 20px; border-radius: 0 0 8px 8px; }}
         .stat {{ display: inline-block; margin: 10px 20px 10px 0; }}
         .stat-value {{ font-size: 24px; font-weight: bold; }}
@@ -71,42 +117,390 @@ Results:
     <div class="container">
         <div class="header">
             <h1 style="margin: 0;">SyncFlow Report</h1>
-            <p style="margin: 5px 0 0 0;">Status: {result.status.value.upper()}</p>
+            <p style="margin: 5px 0 0 0;">Status: {status}</p>
         </div>
         <div class="content">
-            <p><strong>Time:</strong> {result.started_at.strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p><strong>Time:</strong> {started_at}</p>
 
             <div class="stat">
-                <div class="stat-value">{result.salesforce_records}</div>
+                <div class="stat-value">{salesforce_records}</div>
                 <div class="stat-label">Salesforce Records</div>
             </div>
             <div class="stat">
-                <div class="stat-value">{result.jira_issues}</div>
+                <div class="stat-value">{jira_issues}</div>
                 <div class="stat-label">Jira Issues</div>
             </div>
             <div class="stat">
-                <div class="stat-value">{result.rows_written}</div>
+                <div class="stat-value">{rows_written}</div>
                 <div class="stat-label">Rows Written</div>
             </div>
 
-            {f'<div class="errors"><strong>Errors:</strong><br>{"<br>".join(result.errors)}</div>' if result.errors else ''}
+            {errors_html}
         </div>
     </div>
 </body>
 </html>
 """
 
-        msg.attach(MIMEText(text, "plain"))
-        msg.attach(MIMEText(html, "html"))
+# Header color per status; anything else (pending/running) renders in gray
+_STATUS_COLOR: dict[SyncStatus, str] = {
+    SyncStatus.SUCCESS: "#22c55e",
+    SyncStatus.PARTIAL: "#f59e0b",
+    SyncStatus.FAILED: "#ef4444",
+}
+_DEFAULT_COLOR = "#6b7280"
 
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            server.starttls()
-            server.login(settings.smtp_user, settings.smtp_password)
-            server.sendmail(settings.smtp_user, settings.notify_email, msg.as_string())
+# The header color is baked into a copy of the HTML template for every status
+_HTML_TEMPLATES = {
+    status: _HTML_BASE.replace("__STATUS_COLOR__", _STATUS_COLOR.get(status, _DEFAULT_COLOR))
+    for status in SyncStatus
+}
 
-        logger.info(f"Sent notification email to {settings.notify_email}")
-        return True
 
-    except Exception as e:
-        logger.error(f"Failed to send email notification: {e}")
+def _is_dropped(error: Exception) -> bool:
+    """Whether the connection failed, as opposed to the server rejecting a send."""
+    # SMTPException subclasses OSError, so socket errors are the non-SMTP ones
+    return isinstance(error, smtplib.SMTPServerDisconnected) or not isinstance(
+        error, smtplib.SMTPException
+    )
+
+
+def _is_temporary(error: Exception) -> bool:
+    """Whether the server rejected a send with a 4xx reply worth one retry."""
+    if isinstance(error, smtplib.SMTPSenderRefused):
         return False
+    return isinstance(error, smtplib.SMTPResponseException) and 400 <= error.smtp_code < 500
+
+
+class _SMTPConnectionCache:
+    """Keeps one authenticated SMTP connection open between notifications."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn: smtplib.SMTP | None = None
+        self._key: tuple[str, int, str] | None = None
+        self._last_used = 0.0
+
+    def _is_reusable(self, key: tuple[str, int, str]) -> bool:
+        if self._conn is None or self._key != key:
+            return False
+        if time.monotonic() - self._last_used > SMTP_IDLE_TIMEOUT_SECONDS:
+            return False
+
+        # Probe with RSET, which also clears any half-finished transaction
+        try:
+            return self._conn.rset()[0] < 400
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _connect(self, key: tuple[str, int, str]) -> None:
+        self._discard()
+        host, port, user = key
+        implicit = _implicit_tls(port)
+        if implicit:
+            server = smtplib.SMTP_SSL(
+                host, port, timeout=SMTP_TIMEOUT_SECONDS, context=_ssl_context()
+            )
+        else:
+            server = smtplib.SMTP(host, port, timeout=SMTP_TIMEOUT_SECONDS)
+        try:
+            if not implicit:
+                server.starttls(context=_ssl_context())
+            _login(server, user, settings.smtp_password)
+        except BaseException:
+            server.close()
+            raise
+        self._conn = server
+        self._key = key
+
+    def _discard(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except (smtplib.SMTPException, OSError):
+                self._conn.close()
+            self._conn = None
+            self._key = None
+
+    def send_messages(self, messages: list[bytes]) -> int:
+        """Send messages back to back over one session; returns how many were sent.
+
+        The connection is probed once per batch. If connecting or logging in
+        fails, the rest of the batch is dropped rather than retried per
+        message. A message is only retried, once, when a reused connection
+        turns out to have been dropped by the server or the server answers
+        with a temporary (4xx) error; rejected senders or recipients are not.
+        """
+        key = (settings.smtp_host, settings.smtp_port, settings.smtp_user)
+        recipients = [settings.notify_email]
+        sent = 0
+
+        with self._lock:
+            if not self._is_reusable(key):
+                self._discard()
+
+            for i, msg in enumerate(messages):
+                for attempt in range(2):
+                    reused = self._conn is not None
+                    if not reused:
+                        try:
+                            self._connect(key)
+                        except (smtplib.SMTPException, OSError) as e:
+                            logger.error(
+                                f"Failed to connect to SMTP server, dropping "
+                                f"{len(messages) - i} notification(s): {e}"
+                            )
+                            return sent
+
+                    try:
+                        self._conn.sendmail(key[2], recipients, msg)
+                    except (smtplib.SMTPException, OSError) as e:
+                        dropped = _is_dropped(e)
+                        if dropped or _is_temporary(e):
+                            self._discard()
+                            if not attempt and (reused or not dropped):
+                                continue
+                        logger.error(f"Failed to send email notification: {e}")
+                    else:
+                        sent += 1
+                        self._last_used = time.monotonic()
+                    break
+
+        return sent
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard()
+
+
+_smtp_cache = _SMTPConnectionCache()
+
+# Notifications queued within this long of each other share one SMTP session
+NOTIFY_BATCH_WINDOW_SECONDS = 0.5
+
+_notification_queue: queue.Queue[SyncResult | None] = queue.Queue()
+_sender: threading.Thread | None = None
+_sender_lock = threading.Lock()
+
+
+def _drain_notifications() -> None:
+    """Send queued notifications in bursts until a None sentinel arrives."""
+    stopping = False
+    while not stopping:
+        batch = [_notification_queue.get()]
+        while batch[-1] is not None:
+            try:
+                batch.append(_notification_queue.get(timeout=NOTIFY_BATCH_WINDOW_SECONDS))
+            except queue.Empty:
+                break
+
+        received = len(batch)
+        if batch[-1] is None:
+            stopping = True
+            batch.pop()
+
+        try:
+            messages = []
+            for result in batch:
+                try:
+                    messages.append(_build_message(result))
+                except Exception:
+                    logger.exception("Failed to build email notification")
+
+            if messages:
+                sent = _smtp_cache.send_messages(messages)
+                logger.info(f"Sent {sent} notification email(s) to {settings.notify_email}")
+        except Exception:
+            # Keep the sender alive; anything escaping here would strand the queue
+            logger.exception("Failed to send email notifications")
+        finally:
+            for _ in range(received):
+                _notification_queue.task_done()
+
+
+def _start_sender() -> None:
+    global _sender
+
+    with _sender_lock:
+        if _sender is None or not _sender.is_alive():
+            _sender = threading.Thread(
+                target=_drain_notifications, name="syncflow-email", daemon=True
+            )
+            _sender.start()
+
+
+def _stop_sender() -> None:
+    """Flush queued notifications and stop the sender thread."""
+    if _sender is not None and _sender.is_alive():
+        _notification_queue.put(None)
+        _sender.join()
+
+
+# atexit runs hooks in reverse, so queued emails flush before the connection closes
+atexit.register(_smtp_cache.close)
+atexit.register(_stop_sender)
+
+
+def send_sync_notification(result: SyncResult) -> bool:
+    """Queue an email notification about a sync result.
+
+    Sending happens on a background thread so SMTP latency stays off the
+    caller's path, which makes this safe to call from the event loop;
+    returns True once the email is queued.
+    """
+    # Bail out before anything is queued or rendered
+    notify_email, smtp_user, demo_mode = (
+        settings.notify_email, settings.smtp_user, settings.demo_mode
+    )
+    if not notify_email or not smtp_user:
+        logger.info("Email notifications not configured, skipping")
+        return False
+
+    if demo_mode:
+        logger.info(f"Demo mode: Would send email to {notify_email}")
+        return True
+
+    _start_sender()
+    _notification_queue.put(result)
+    return True
+
+
+def _render_errors(errors: tuple[str, ...]) -> tuple[str, str]:
+    """Render the (text, html) errors sections; errors are HTML-escaped."""
+    if not errors:
+        return "No errors", ""
+    return (
+        "Errors: " + "\n".join(errors),
+        '<div class="errors"><strong>Errors:</strong><br>'
+        + "<br>".join(map(html_lib.escape, errors)) + "</div>",
+    )
+
+
+# Bodies depend only on the result's fields (nothing per recipient), so
+# identical results can reuse an earlier rendering
+@functools.lru_cache(maxsize=64)
+def _render_bodies(
+    status: SyncStatus,
+    started_at: str,
+    completed_at: str,
+    salesforce_records: int,
+    jira_issues: int,
+    rows_written: int,
+    conflicts_resolved: int,
+    errors: tuple[str, ...],
+    fmt: str,
+) -> tuple[str | None, str | None]:
+    """Render the (text, html) bodies; a part not wanted by fmt is None."""
+    errors_text, errors_html = _render_errors(errors)
+    params = {
+        "status": _UPPER_STATUS[status],
+        "started_at": started_at,
+        "completed_at": completed_at,
+        "salesforce_records": salesforce_records,
+        "jira_issues": jira_issues,
+        "rows_written": rows_written,
+        "conflicts_resolved": conflicts_resolved,
+        "errors_text": errors_text,
+        "errors_html": errors_html,
+    }
+
+    text = html = None
+    if fmt != "html":
+        text = _TEXT_TEMPLATE.format_map(params)
+    if fmt != "text":
+        html = _HTML_TEMPLATES[status].format_map(params)
+    return text, html
+
+
+# Pre-encoded MIME scaffolding for the fast path. Parts are base64-encoded,
+# so the fixed boundary can never occur inside a body
+_BOUNDARY = "=_SyncFlowBoundary_="
+_MIME_VERSION = b"MIME-Version: 1.0\r\n"
+_MULTIPART_HEADER = (
+    f'Content-Type: multipart/alternative; boundary="{_BOUNDARY}"\r\n\r\n'.encode("ascii")
+)
+_TEXT_PART_HEADER = (
+    b'Content-Type: text/plain; charset="utf-8"\r\n'
+    b"Content-Transfer-Encoding: base64\r\n\r\n"
+)
+_HTML_PART_HEADER = (
+    b'Content-Type: text/html; charset="utf-8"\r\n'
+    b"Content-Transfer-Encoding: base64\r\n\r\n"
+)
+_DELIMITER = f"--{_BOUNDARY}\r\n".encode("ascii")
+_CLOSE_DELIMITER = f"--{_BOUNDARY}--\r\n".encode("ascii")
+
+
+def _is_plain_header(value: str) -> bool:
+    """Whether a header value can be written verbatim without encoding or folding."""
+    return value.isascii() and "\r" not in value and "\n" not in value and len(value) < 900
+
+
+def _encode_body(body: str) -> bytes:
+    return base64.encodebytes(body.encode("utf-8")).replace(b"\n", b"\r\n")
+
+
+def _serialize_message(
+    subject: str, sender: str, recipient: str, text: str | None, html: str | None
+) -> bytes:
+    """Splice headers and bodies into the pre-encoded MIME scaffolding."""
+    headers = (
+        f"Subject: {subject}\r\nFrom: {sender}\r\nTo: {recipient}\r\n"
+        f"Date: {formatdate(localtime=True)}\r\n"
+    ).encode("ascii")
+
+    if text is not None and html is not None:
+        return b"".join((
+            headers, _MIME_VERSION, _MULTIPART_HEADER,
+            _DELIMITER, _TEXT_PART_HEADER, _encode_body(text),
+            _DELIMITER, _HTML_PART_HEADER, _encode_body(html),
+            _CLOSE_DELIMITER,
+        ))
+
+    part_header, body = (_TEXT_PART_HEADER, text) if text is not None else (_HTML_PART_HEADER, html)
+    return b"".join((headers, _MIME_VERSION, part_header, _encode_body(body)))
+
+
+def _build_message(result: SyncResult) -> bytes:
+    """Render the notification email for a sync result as ready-to-send bytes.
+
+    The email package builds the message instead of the pre-encoded fast path
+    when smtp_strict is set or the addresses need header encoding.
+    """
+    sender, recipient, fmt = (
+        settings.smtp_user, settings.notify_email, settings.notify_format
+    )
+    started_str = result.started_at.strftime(_FMT)
+    completed_str = result.completed_at.strftime(_FMT) if result.completed_at else "N/A"
+    text, html = _render_bodies(
+        result.status,
+        started_str,
+        completed_str,
+        result.salesforce_records,
+        result.jira_issues,
+        result.rows_written,
+        result.conflicts_resolved,
+        tuple(result.errors),
+        fmt,
+    )
+    subject = _SUBJECTS[result.status]
+
+    if not settings.smtp_strict and _is_plain_header(sender) and _is_plain_header(recipient):
+        return _serialize_message(subject, sender, recipient, text, html)
+
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = sender
+    msg["To"] = recipient
+    msg["Date"] = formatdate(localtime=True)
+
+    if text is not None:
+        msg.set_content(text)
+    if html is not None:
+        if text is None:
+            msg.set_content(html, subtype="html")
+        else:
+            msg.add_alternative(html, subtype="html")
+
+    # Serialize once with CRLF line endings so sendmail sends it unchanged
+    return msg.as_bytes(policy=policy.SMTP)
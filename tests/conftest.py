@@ -0,0 +1,7 @@
+"""Shared test configuration."""
+
+import os
+
+# Enable demo mode for tests. This must happen before src.config is imported,
+# which is why it runs at conftest import rather than in a session fixture
+os.environ["DEMO_MODE"] = "true"
@@ -0,0 +1,104 @@
+"""Tests for the dashboard API routes."""
+
+import asyncio
+
+import fakeredis
+from fastapi.testclient import TestClient
+
+from src import main
+from src.main import app
+from src.services.state import SyncStateStore, sync_state
+
+client = TestClient(app)
+
+
+class TestStatusEndpoints:
+    """Tests for the read-only status endpoints."""
+
+    def test_sync_updates_status(self):
+        """Test a manual sync is reflected by /status."""
+        synced = client.post("/api/sync")
+        assert synced.status_code == 200
+
+        status = client.get("/api/status")
+        assert status.status_code == 200
+        assert status.json()["data"] == synced.json()["data"]
+
+    def test_history_includes_latest_sync(self):
+        """Test /history picks up a newly completed sync."""
+        before = len(client.get("/api/history").json()["data"]["history"])
+        client.post("/api/sync")
+
+        history = client.get("/api/history").json()["data"]["history"]
+        assert len(history) == min(before + 1, 50)
+
+    def test_status_not_modified_until_next_sync(self):
+        """Test /status answers 304 for a current ETag and 200 after a sync."""
+        etag = client.get("/api/status").headers["etag"]
+
+        unchanged = client.get("/api/status", headers={"If-None-Match": etag})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+
+        client.post("/api/sync")
+        changed = client.get("/api/status", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+
+    def test_etag_follows_shared_counter(self, monkeypatch):
+        """Test /status revalidates against the counter every worker shares."""
+        server = fakeredis.FakeServer()
+        monkeypatch.setattr(sync_state, "_redis", fakeredis.FakeAsyncRedis(server=server))
+        other_worker = SyncStateStore()
+        other_worker._redis = fakeredis.FakeAsyncRedis(server=server)
+
+        # Keep one event loop for the whole test, as a running worker would
+        with TestClient(app) as worker:
+            worker.portal.call(other_worker.publish, {"status": "success", "run": 1})
+            first = worker.get("/api/status")
+            assert first.json()["data"]["run"] == 1
+            etag = first.headers["etag"]
+            assert worker.get("/api/status", headers={"If-None-Match": etag}).status_code == 304
+
+            # A sync finishing on another worker invalidates this worker's ETag
+            worker.portal.call(other_worker.publish, {"status": "success", "run": 2})
+            changed = worker.get("/api/status", headers={"If-None-Match": etag})
+            assert changed.status_code == 200
+            assert changed.json()["data"]["run"] == 2
+
+    def test_sync_rejected_while_running(self):
+        """Test /sync answers 409 while another sync holds the guard."""
+        assert asyncio.run(sync_state.acquire_run_lock()) is True
+        try:
+            assert client.post("/api/sync").status_code == 409
+        finally:
+            asyncio.run(sync_state.release_run_lock())
+
+        assert client.post("/api/sync").status_code == 200
+
+    def test_config_hides_credentials(self):
+        """Test /config reports only non-sensitive settings."""
+        data = client.get("/api/config").json()["data"]
+        assert data["demo_mode"] is True
+        assert "sf_password" not in data
+
+
+class TestScheduledSync:
+    """Tests for the cron-triggered sync."""
+
+    def test_runs_once_per_fire_time(self, monkeypatch):
+        """Test a fire already handled by a finished sync is not run again."""
+        class FixedDatetime(main.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2024, 1, 2, 7, 0, 0, 250000, tzinfo=tz)
+
+        notified = []
+        monkeypatch.setattr(main, "datetime", FixedDatetime)
+        monkeypatch.setattr(main, "sync_state", SyncStateStore())
+        monkeypatch.setattr(main, "send_sync_notification", notified.append)
+
+        asyncio.run(main.scheduled_sync())
+        asyncio.run(main.scheduled_sync())
+
+        assert len(notified) == 1
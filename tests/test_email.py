@@ -0,0 +1,349 @@
+"""Tests for email notifications."""
+
+import smtplib
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from email import policy
+from email.message import EmailMessage
+from email.parser import BytesParser
+
+import pytest
+
+from src.utils import email
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP, recording what each connection did."""
+
+    instances = []
+
+    def __init__(self, host, port, **kwargs):
+        self.host = host
+        self.port = port
+        self.timeout = kwargs.get("timeout")
+        self.logins = 0
+        self.sent = []
+        self.commands = []
+        self.connected = True
+        FakeSMTP.instances.append(self)
+
+    def starttls(self, **kwargs):
+        self.tls = "starttls"
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def ehlo_or_helo_if_needed(self):
+        pass
+
+    def docmd(self, cmd, args=""):
+        self.commands.append((cmd, args))
+        return (235, b"Authentication successful")
+
+    def rset(self):
+        if not self.connected:
+            raise smtplib.SMTPServerDisconnected("gone")
+        return (250, b"OK")
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        if not self.connected:
+            raise smtplib.SMTPServerDisconnected("gone")
+        self.sent.append(parse(msg))
+
+    def quit(self):
+        self.connected = False
+
+    def close(self):
+        self.connected = False
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """Route SMTP traffic to FakeSMTP with notifications configured."""
+    FakeSMTP.instances = []
+    monkeypatch.setattr(email.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email, "settings", replace(
+        email.settings,
+        demo_mode=False,
+        smtp_user="bot@example.com",
+        notify_email="alerts@example.com",
+    ))
+    return FakeSMTP
+
+
+def wait_for_sender(timeout: float = 5.0) -> None:
+    """Wait until the sender thread has processed everything queued."""
+    deadline = time.monotonic() + timeout
+    while email._notification_queue.unfinished_tasks:
+        assert time.monotonic() < deadline, "queued notifications were not processed"
+        time.sleep(0.01)
+
+
+def parse(raw: bytes) -> EmailMessage:
+    """Parse wire-format bytes the way a mailbox would store them."""
+    return BytesParser(policy=policy.default).parsebytes(raw.replace(b"\r\n", b"\n"))
+
+
+def message(body: str) -> bytes:
+    msg = EmailMessage()
+    msg.set_content(body)
+    return msg.as_bytes(policy=policy.SMTP)
+
+
+class TestSMTPConnectionCache:
+    """Tests for reusing SMTP connections between notifications."""
+
+    def test_connection_is_reused(self, smtp):
+        """Test consecutive sends share one connection and login."""
+        cache = email._SMTPConnectionCache()
+        assert cache.send_messages([message("one")]) == 1
+        assert cache.send_messages([message("two")]) == 1
+
+        [conn] = smtp.instances
+        assert conn.logins == 1
+        assert conn.timeout == email.SMTP_TIMEOUT_SECONDS
+        assert [m.get_content() for m in conn.sent] == ["one\n", "two\n"]
+
+    def test_dropped_connection_is_replaced(self, smtp):
+        """Test a connection the server closed is replaced on the next send."""
+        cache = email._SMTPConnectionCache()
+        cache.send_messages([message("one")])
+        smtp.instances[0].connected = False
+
+        assert cache.send_messages([message("two")]) == 1
+
+        assert len(smtp.instances) == 2
+        assert smtp.instances[1].sent[0].get_content() == "two\n"
+
+    def test_batch_shares_one_session(self, smtp):
+        """Test a batch is sent over a single connection."""
+        cache = email._SMTPConnectionCache()
+        assert cache.send_messages([message("one"), message("two")]) == 2
+
+        [conn] = smtp.instances
+        assert len(conn.sent) == 2
+
+    def test_failed_login_aborts_batch(self, smtp, monkeypatch):
+        """Test a rejected login is attempted once per burst, not once per message."""
+        def login(self, user, password):
+            self.logins += 1
+            raise smtplib.SMTPAuthenticationError(535, b"Bad credentials")
+
+        monkeypatch.setattr(FakeSMTP, "login", login)
+
+        cache = email._SMTPConnectionCache()
+        assert cache.send_messages([message("one"), message("two"), message("three")]) == 0
+
+        [conn] = smtp.instances
+        assert conn.logins == 1
+
+    @pytest.mark.parametrize("error, attempts", [
+        (smtplib.SMTPRecipientsRefused({"alerts@example.com": (550, b"No such user")}), 1),
+        (smtplib.SMTPSenderRefused(451, b"Try again later", "bot@example.com"), 1),
+        (smtplib.SMTPDataError(451, b"Try again later"), 2),
+    ])
+    def test_only_temporary_rejections_are_retried(self, smtp, monkeypatch, error, attempts):
+        """Test a 4xx reply is retried once while refused addresses are not."""
+        calls = []
+
+        def sendmail(self, from_addr, to_addrs, msg):
+            calls.append(self)
+            raise error
+
+        monkeypatch.setattr(FakeSMTP, "sendmail", sendmail)
+
+        cache = email._SMTPConnectionCache()
+        assert cache.send_messages([message("one")]) == 0
+        assert len(calls) == attempts
+
+    def test_plain_auth_skips_negotiation(self, smtp, monkeypatch):
+        """Test smtp_auth=plain authenticates with a single AUTH PLAIN command."""
+        monkeypatch.setattr(email, "settings", replace(
+            email.settings, smtp_auth="plain", smtp_password="secret"
+        ))
+
+        cache = email._SMTPConnectionCache()
+        assert cache.send_messages([message("one")]) == 1
+
+        [conn] = smtp.instances
+        assert conn.logins == 0
+        assert conn.commands == [("AUTH PLAIN", "AGJvdEBleGFtcGxlLmNvbQBzZWNyZXQ=")]
+
+    def test_port_465_uses_implicit_tls(self, smtp, monkeypatch):
+        """Test port 465 connects with SMTP_SSL and skips STARTTLS."""
+        ssl_connections = []
+
+        def smtp_ssl(host, port, timeout=None, context=None):
+            conn = FakeSMTP(host, port, timeout=timeout)
+            conn.tls = "implicit"
+            ssl_connections.append(conn)
+            return conn
+
+        monkeypatch.setattr(email.smtplib, "SMTP_SSL", smtp_ssl)
+        monkeypatch.setattr(email, "settings", replace(email.settings, smtp_port=465))
+
+        cache = email._SMTPConnectionCache()
+        assert cache.send_messages([message("one")]) == 1
+
+        [conn] = ssl_connections
+        assert conn.tls == "implicit"
+        assert conn.timeout == email.SMTP_TIMEOUT_SECONDS
+
+
+class TestSendSyncNotification:
+    """Tests for queuing sync notifications."""
+
+    def test_burst_is_sent_in_background(self, smtp, monkeypatch):
+        """Test queued emails are sent off the caller's thread in one session."""
+        result = email.SyncResult(
+            status=email.SyncStatus.SUCCESS, started_at=datetime.now()
+        )
+        monkeypatch.setattr(email, "_smtp_cache", email._SMTPConnectionCache())
+
+        assert email.send_sync_notification(result) is True
+        assert email.send_sync_notification(result) is True
+        wait_for_sender()
+
+        [conn] = smtp.instances
+        assert [m["To"] for m in conn.sent] == ["alerts@example.com"] * 2
+
+    def test_slow_smtp_does_not_block_caller(self, smtp, monkeypatch):
+        """Test queuing returns while the SMTP send is still in progress."""
+        release = threading.Event()
+
+        class SlowCache:
+            def send_messages(self, messages):
+                release.wait(5)
+                return len(messages)
+
+        monkeypatch.setattr(email, "_smtp_cache", SlowCache())
+        result = email.SyncResult(
+            status=email.SyncStatus.SUCCESS, started_at=datetime.now()
+        )
+
+        assert email.send_sync_notification(result) is True
+        assert email._notification_queue.unfinished_tasks == 1
+
+        release.set()
+        wait_for_sender()
+
+    def test_sender_survives_unexpected_errors(self, smtp, monkeypatch):
+        """Test a non-SMTP error on one send doesn't stop later notifications."""
+        logins = []
+
+        def login(self, user, password):
+            logins.append(user)
+            if len(logins) == 1:
+                raise UnicodeEncodeError("ascii", "pässword", 1, 2, "ordinal not in range")
+
+        monkeypatch.setattr(FakeSMTP, "login", login)
+        monkeypatch.setattr(email, "_smtp_cache", email._SMTPConnectionCache())
+        result = email.SyncResult(
+            status=email.SyncStatus.SUCCESS, started_at=datetime.now()
+        )
+
+        assert email.send_sync_notification(result) is True
+        wait_for_sender()
+        assert email.send_sync_notification(result) is True
+        wait_for_sender()
+
+        assert sum(len(conn.sent) for conn in smtp.instances) == 1
+
+    def test_not_configured(self, monkeypatch):
+        """Test nothing is queued without a recipient."""
+        monkeypatch.setattr(email, "settings", replace(email.settings, notify_email=""))
+        result = email.SyncResult(
+            status=email.SyncStatus.SUCCESS, started_at=datetime.now()
+        )
+        assert email.send_sync_notification(result) is False
+
+    def test_demo_mode_renders_nothing(self, smtp, monkeypatch):
+        """Test demo mode returns before any email is built or queued."""
+        monkeypatch.setattr(email, "settings", replace(email.settings, demo_mode=True))
+        monkeypatch.setattr(email, "_build_message", None)
+        result = email.SyncResult(
+            status=email.SyncStatus.SUCCESS, started_at=datetime.now()
+        )
+
+        assert email.send_sync_notification(result) is True
+        assert email._notification_queue.unfinished_tasks == 0
+
+    def test_failure_email_lists_errors(self, smtp):
+        """Test a failed sync renders its status color and errors."""
+        result = email.SyncResult(
+            status=email.SyncStatus.FAILED,
+            started_at=datetime(2024, 1, 2, 3, 4, 5),
+            errors=["Jira fetch error: boom"],
+        )
+
+        sent = parse(email._build_message(result))
+        text = sent.get_body(("plain",)).get_content()
+        html = sent.get_body(("html",)).get_content()
+        assert sent["Subject"] == "SyncFlow: FAILED"
+        assert "Started: 2024-01-02 03:04:05" in text
+        assert "Errors: Jira fetch error: boom" in text
+        assert "background: #ef4444;" in html
+        assert "<br>Jira fetch error: boom</div>" in html
+
+    def test_errors_are_escaped_in_html(self, smtp):
+        """Test error messages cannot inject markup into the HTML body."""
+        result = email.SyncResult(
+            status=email.SyncStatus.FAILED,
+            started_at=datetime.now(),
+            errors=["<script>alert(1)</script>"],
+        )
+
+        sent = parse(email._build_message(result))
+
+        html = sent.get_body(("html",)).get_content()
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+        assert "<script>" not in html
+        assert "<script>" in sent.get_body(("plain",)).get_content()
+
+    def test_text_format_skips_html(self, smtp, monkeypatch):
+        """Test notify_format=text sends a single plain-text part."""
+        monkeypatch.setattr(email, "settings", replace(email.settings, notify_format="text"))
+        result = email.SyncResult(
+            status=email.SyncStatus.SUCCESS, started_at=datetime.now()
+        )
+
+        sent = parse(email._build_message(result))
+
+        assert not sent.is_multipart()
+        assert sent.get_content_type() == "text/plain"
+
+    def test_identical_results_reuse_rendering(self, smtp):
+        """Test bodies for an identical result come from the render cache."""
+        result = email.SyncResult(
+            status=email.SyncStatus.SUCCESS, started_at=datetime(2024, 1, 2, 3, 4, 5)
+        )
+        email._build_message(result)
+        hits = email._render_bodies.cache_info().hits
+
+        email._build_message(replace(result))
+
+        assert email._render_bodies.cache_info().hits == hits + 1
+
+    def test_fast_path_matches_strict_message(self, smtp, monkeypatch):
+        """Test pre-encoded bytes parse back to the same email as the strict path."""
+        result = email.SyncResult(
+            status=email.SyncStatus.PARTIAL,
+            started_at=datetime(2024, 1, 2, 3, 4, 5),
+            errors=["Sheets write error: quota – retry later"],
+        )
+
+        fast = email._build_message(result)
+        monkeypatch.setattr(email, "settings", replace(email.settings, smtp_strict=True))
+        strict = parse(email._build_message(result))
+
+        # Re-serializing with the SMTP policy must round-trip cleanly
+        parsed = parse(parse(fast).as_bytes(policy=policy.SMTP))
+        for header in ("Subject", "From", "To"):
+            assert parsed[header] == strict[header]
+        for subtype in ("plain", "html"):
+            assert (
+                parsed.get_body((subtype,)).get_content()
+                == strict.get_body((subtype,)).get_content()
+            )
@@ -0,0 +1,155 @@
+"""Tests for the Google Sheets service."""
+
+import asyncio
+import threading
+import time
+from dataclasses import replace
+
+import pytest
+
+from src.services import sheets
+from src.services.sheets import SheetsService, _RowBatcher
+
+
+class FakeSpreadsheets:
+    """Records batchUpdate bodies instead of calling the API."""
+
+    def __init__(self):
+        self.bodies = []
+
+    def spreadsheets(self):
+        return self
+
+    def batchUpdate(self, spreadsheetId, body):
+        self.bodies.append(body)
+        return self
+
+    def execute(self):
+        return {}
+
+
+class OverlapDetectingSpreadsheets(FakeSpreadsheets):
+    """Fails if two threads are inside an API call at the same time."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.overlapped = False
+
+    def values(self):
+        return self
+
+    def append(self, **kwargs):
+        return self
+
+    def execute(self):
+        self.active += 1
+        if self.active > 1:
+            self.overlapped = True
+        time.sleep(0.01)
+        self.active -= 1
+        return {}
+
+
+class TestWriteSheet:
+    """Tests for writing merged data to the sheet."""
+
+    def _service(
+        self, monkeypatch, fake: FakeSpreadsheets | None = None
+    ) -> tuple[SheetsService, FakeSpreadsheets]:
+        monkeypatch.setattr(sheets, "settings", replace(sheets.settings, demo_mode=False))
+        fake = fake or FakeSpreadsheets()
+        service = SheetsService()
+        service._service = fake
+        service._sheet_id = 7
+        return service, fake
+
+    def test_clear_and_write_in_one_request(self, monkeypatch):
+        """Test small writes clear and append in a single batchUpdate."""
+        service, fake = self._service(monkeypatch)
+
+        assert service.write_sheet([["Name", "Amount"], ["Acme", 50000.0]]) == 2
+
+        [body] = fake.bodies
+        clear, append = body["requests"]
+        assert clear["updateCells"]["range"] == {"sheetId": 7}
+        assert clear["updateCells"]["fields"] == sheets.CELL_FIELDS
+        assert append["appendCells"]["rows"][1]["values"] == [
+            {"userEnteredValue": {"stringValue": "Acme"}},
+            {"userEnteredValue": {"numberValue": 50000.0}},
+        ]
+
+    def test_iso_dates_are_written_as_dates(self, monkeypatch):
+        """Test close dates land as date serials rather than text."""
+        service, fake = self._service(monkeypatch)
+
+        service.write_sheet([["Close Date"], ["2024-02-15"]])
+
+        append = fake.bodies[0]["requests"][1]["appendCells"]
+        [cell] = append["rows"][1]["values"]
+        assert "stringValue" not in cell["userEnteredValue"]
+        assert cell["userEnteredValue"]["numberValue"] == 45337
+        assert cell["userEnteredFormat"]["numberFormat"]["type"] == "DATE"
+        assert "userEnteredFormat.numberFormat" in append["fields"]
+
+    def test_large_writes_are_chunked(self, monkeypatch):
+        """Test writes larger than a chunk are split across requests."""
+        service, fake = self._service(monkeypatch)
+        monkeypatch.setattr(sheets, "WRITE_CHUNK_ROWS", 2)
+
+        assert service.write_sheet([["a"], ["b"], ["c"]]) == 3
+
+        assert [len(body["requests"]) for body in fake.bodies] == [2, 1]
+        assert len(fake.bodies[1]["requests"][0]["appendCells"]["rows"]) == 1
+
+    def test_empty_write_only_clears(self, monkeypatch):
+        """Test writing no rows still clears the sheet."""
+        service, fake = self._service(monkeypatch)
+
+        assert service.write_sheet([]) == 0
+        assert [list(r) for r in fake.bodies[0]["requests"]] == [["updateCells"]]
+
+    def test_writes_and_appends_do_not_overlap(self, monkeypatch):
+        """Test sync writes and batched appends never share the transport at once."""
+        service, fake = self._service(monkeypatch, fake=OverlapDetectingSpreadsheets())
+
+        threads = [
+            threading.Thread(target=service.write_sheet, args=([["a"]],)),
+            threading.Thread(target=service._append_rows, args=([["b"]],)),
+            threading.Thread(target=service._append_rows, args=([["c"]],)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not fake.overlapped
+
+
+class TestRowBatcher:
+    """Tests for batching single-row appends."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_appends_share_one_flush(self):
+        """Test rows queued together are written in one call."""
+        flushed = []
+        batcher = _RowBatcher(lambda rows: flushed.append(rows) or True, max_wait=0.05)
+        batcher.start()
+
+        results = await asyncio.gather(*(batcher.enqueue([i]) for i in range(3)))
+        await batcher.stop()
+
+        assert results == [True, True, True]
+        assert flushed == [[[0], [1], [2]]]
+
+    @pytest.mark.asyncio
+    async def test_batches_are_capped(self):
+        """Test a burst larger than max_batch is split."""
+        flushed = []
+        batcher = _RowBatcher(lambda rows: flushed.append(rows) or True, max_batch=2)
+        batcher.start()
+
+        await asyncio.gather(*(batcher.enqueue([i]) for i in range(3)))
+        await batcher.stop()
+
+        assert [len(rows) for rows in flushed] == [2, 1]
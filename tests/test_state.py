@@ -0,0 +1,90 @@
+"""Tests for sync state shared through Redis."""
+
+from datetime import datetime, timezone
+
+import fakeredis
+import pytest
+
+from src.services.state import HISTORY_LIMIT, SyncStateStore
+
+
+@pytest.fixture
+def server():
+    """One fake Redis server that several workers' stores can share."""
+    return fakeredis.FakeServer()
+
+
+def store(server: fakeredis.FakeServer) -> SyncStateStore:
+    """A SyncStateStore connected to the shared fake server, as one worker."""
+    state = SyncStateStore()
+    state._redis = fakeredis.FakeAsyncRedis(server=server)
+    return state
+
+
+class TestRunLock:
+    """Tests for the cross-worker single-flight guard."""
+
+    @pytest.mark.asyncio
+    async def test_lock_is_exclusive_until_released(self, server):
+        """Test a second worker cannot sync until the first releases the guard."""
+        first, second = store(server), store(server)
+
+        assert await first.acquire_run_lock() is True
+        assert await second.acquire_run_lock() is False
+
+        await first.release_run_lock()
+        assert await second.acquire_run_lock() is True
+        await second.release_run_lock()
+
+    @pytest.mark.asyncio
+    async def test_scheduled_fire_is_claimed_once(self, server):
+        """Test only one worker runs a given scheduled fire, even after it finished."""
+        first, second = store(server), store(server)
+        fire_time = datetime(2024, 1, 2, 7, 0, tzinfo=timezone.utc)
+
+        assert await first.claim_scheduled_run(fire_time) is True
+        assert await second.claim_scheduled_run(fire_time) is False
+        assert await second.claim_scheduled_run(fire_time.replace(day=3)) is True
+
+    @pytest.mark.asyncio
+    async def test_scheduled_fire_is_claimed_once_in_memory(self):
+        """Test the in-memory fallback also skips a repeated fire time."""
+        state = SyncStateStore()
+        fire_time = datetime(2024, 1, 2, 7, 0, tzinfo=timezone.utc)
+
+        assert await state.claim_scheduled_run(fire_time) is True
+        assert await state.claim_scheduled_run(fire_time) is False
+
+
+class TestPublish:
+    """Tests for publishing results to every worker."""
+
+    @pytest.mark.asyncio
+    async def test_history_is_trimmed_and_oldest_first(self, server):
+        """Test history keeps the newest results, returned oldest first."""
+        writer, reader = store(server), store(server)
+
+        for i in range(HISTORY_LIMIT + 5):
+            await writer.publish({"run": i})
+
+        history = await reader.history()
+        assert len(history) == HISTORY_LIMIT
+        assert history[0] == {"run": 5}
+        assert history[-1] == {"run": HISTORY_LIMIT + 4}
+        assert await reader.last_result() == {"run": HISTORY_LIMIT + 4}
+        assert (await reader.version()).endswith(f"-{HISTORY_LIMIT + 5}")
+
+    @pytest.mark.asyncio
+    async def test_version_changes_after_redis_is_flushed(self, server):
+        """Test a wiped counter starts a new epoch instead of repeating old versions."""
+        writer, reader = store(server), store(server)
+        await writer.publish({"run": 1})
+        before = await reader.version()
+
+        await writer._redis.flushall()
+        await writer.publish({"run": 1})
+
+        after = await reader.version()
+        assert after.endswith("-1")
+        assert after != before
+        assert await writer.version() == after
@@ -1,14 +1,21 @@
 """Tests for the sync service."""
 
-import os
-import pytest
+import asyncio
+import threading
+from dataclasses import replace
 
-# Enable demo mode for tests
-os.environ["DEMO_MODE"] = "true"
+import httpx
+import pytest
+from simple_salesforce.api import DEFAULT_API_VERSION
 
+from src.services import http
 from src.services.sync import sync_service, SyncStatus
-from src.services.salesforce import salesforce_service
-from src.services.jira_service import jira_service
+from src.services import salesforce as salesforce_module
+from src.services.salesforce import salesforce_service, SalesforceService
+from src.services import jira_service as jira_module
+from src.services.jira_service import jira_service, JiraService
+
+BASE_URL = f"https://example.my.salesforce.com/services/data/v{DEFAULT_API_VERSION}"
 
 
 class TestSalesforceService:
@@ -18,55 +25,217 @@ class TestSalesforceService:
         """Test connection in demo mode."""
         assert salesforce_service.connect() is True
 
-    def test_fetch_opportunities_demo_mode(self):
+    @pytest.mark.asyncio
+    async def test_fetch_opportunities_demo_mode(self):
         """Test fetching opportunities in demo mode."""
         salesforce_service.connect()
-        opps = salesforce_service.fetch_opportunities()
+        opps = await salesforce_service.fetch_opportunities()
         assert len(opps) > 0
         assert "Id" in opps[0]
         assert "Name" in opps[0]
 
+    @pytest.mark.asyncio
+    async def test_fetch_opportunities_parses_rest_response(self, monkeypatch):
+        """Test records from the REST query endpoint have their metadata stripped."""
+        monkeypatch.setattr(
+            salesforce_module, "settings", replace(salesforce_module.settings, demo_mode=False)
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == f"/services/data/v{DEFAULT_API_VERSION}/query"
+            assert request.headers["Authorization"] == "Bearer session"
+            return httpx.Response(200, json={"totalSize": 1, "done": True, "records": [{
+                "attributes": {"type": "Opportunity", "url": "/sobjects/Opportunity/006A"},
+                "Id": "006A",
+                "Name": "Acme Corp - Renewal",
+                "CloseDate": "2024-02-15",
+            }]})
+
+        monkeypatch.setattr(
+            salesforce_module,
+            "get_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        service = SalesforceService()
+        service._base_url = BASE_URL
+        service._headers = {"Authorization": "Bearer session"}
+
+        assert await service.fetch_opportunities() == [{
+            "Id": "006A",
+            "Name": "Acme Corp - Renewal",
+            "CloseDate": "2024-02-15",
+        }]
+        assert service._session_is_fresh()
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_forces_new_login(self, monkeypatch):
+        """Test a failed query marks the session stale so connect() logs in again."""
+        monkeypatch.setattr(
+            salesforce_module, "settings", replace(salesforce_module.settings, demo_mode=False)
+        )
+        monkeypatch.setattr(
+            salesforce_module,
+            "get_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: httpx.Response(401, json=[{"errorCode": "INVALID_SESSION_ID"}])
+            )),
+        )
+        service = SalesforceService()
+        service._base_url = BASE_URL
+        service._last_used = float("inf")
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await service.fetch_opportunities()
+        assert service._last_used == 0.0
+        assert not service._session_is_fresh()
+
 
 class TestJiraService:
     """Tests for Jira integration."""
 
-    def test_connect_demo_mode(self):
+    @pytest.mark.asyncio
+    async def test_connect_demo_mode(self):
         """Test connection in demo mode."""
-        assert jira_service.connect() is True
+        assert await jira_service.connect() is True
 
-    def test_fetch_issues_demo_mode(self):
+    @pytest.mark.asyncio
+    async def test_fetch_issues_demo_mode(self):
         """Test fetching issues in demo mode."""
-        jira_service.connect()
-        issues = jira_service.fetch_issues()
+        await jira_service.connect()
+        issues = await jira_service.fetch_issues()
         assert len(issues) > 0
         assert "key" in issues[0]
         assert "summary" in issues[0]
 
+    @pytest.mark.asyncio
+    async def test_fetch_issues_parses_rest_response(self, monkeypatch):
+        """Test issues from the REST search endpoint are flattened."""
+        monkeypatch.setattr(
+            jira_module, "settings", replace(jira_module.settings, demo_mode=False)
+        )
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == "/rest/api/3/search/jql"
+            return httpx.Response(200, json={"issues": [{
+                "key": "SALES-1",
+                "fields": {
+                    "summary": "Call Acme",
+                    "status": {"name": "To Do"},
+                    "assignee": None,
+                    "priority": {"name": "High"},
+                    "created": "2024-01-15T09:30:00.000+0000",
+                    "updated": "2024-01-16T10:00:00.000+0000",
+                },
+            }]})
+
+        monkeypatch.setattr(
+            jira_module,
+            "get_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        service = JiraService()
+        service._base_url = "https://jira.test"
+        service._auth = httpx.BasicAuth("user", "token")
+
+        assert await service.fetch_issues() == [{
+            "key": "SALES-1",
+            "summary": "Call Acme",
+            "status": "To Do",
+            "assignee": "Unassigned",
+            "priority": "High",
+            "created": "2024-01-15",
+            "updated": "2024-01-16",
+        }]
+
+
+@pytest.fixture(scope="class")
+def demo_result():
+    """One demo-mode sync shared by tests that only inspect its result."""
+    return sync_service.run_sync()
+
 
 class TestSyncService:
     """Tests for the main sync orchestration."""
 
-    def test_run_sync_demo_mode(self):
+    def test_run_sync_demo_mode(self, demo_result):
         """Test running a full sync in demo mode."""
-        result = sync_service.run_sync()
+        result = demo_result
 
         assert result.status in [SyncStatus.SUCCESS, SyncStatus.PARTIAL]
         assert result.salesforce_records > 0
         assert result.jira_issues > 0
         assert result.completed_at is not None
 
+    def test_run_sync_closes_http_pool(self, monkeypatch):
+        """Test run_sync closes the pool bound to its loop before returning."""
+        async def fake_run():
+            return http.get_client()
+
+        monkeypatch.setattr(sync_service, "run_sync_async", fake_run)
+
+        assert sync_service.run_sync().is_closed
+
+    def test_pools_are_per_loop(self):
+        """Test closing one loop's pool leaves the pool of a loop still running open."""
+        other = asyncio.new_event_loop()
+        thread = threading.Thread(target=other.run_forever)
+        thread.start()
+        try:
+            async def get():
+                return http.get_client()
+
+            async def get_and_close():
+                client = http.get_client()
+                await http.close_client()
+                return client
+
+            old = asyncio.run_coroutine_threadsafe(get(), other).result()
+            closed = asyncio.run(get_and_close())
+
+            assert closed is not old
+            assert closed.is_closed
+            assert not old.is_closed
+            assert asyncio.run_coroutine_threadsafe(get(), other).result() is old
+        finally:
+            asyncio.run_coroutine_threadsafe(http.close_client(), other).result()
+            other.call_soon_threadsafe(other.stop)
+            thread.join()
+            other.close()
+
     def test_sync_history(self):
         """Test that sync history is recorded."""
         initial_count = len(sync_service.history)
         sync_service.run_sync()
         assert len(sync_service.history) > initial_count
 
-    def test_result_to_dict(self):
+    def test_result_to_dict(self, demo_result):
         """Test result serialization."""
-        result = sync_service.run_sync()
-        data = result.to_dict()
+        data = demo_result.to_dict()
 
         assert "status" in data
         assert "started_at" in data
         assert "salesforce_records" in data
         assert "duration_seconds" in data
+
+    def test_completed_result_dict_is_cached(self, demo_result):
+        """Test a completed result is serialized only once."""
+        assert demo_result.to_dict() is demo_result.to_dict()
+
+    def test_merge_matches_issues_by_company_name(self):
+        """Test issues are matched to the first opportunity with their company name."""
+        opportunities = [
+            {"Id": "1", "Name": "Acme Corp - Renewal"},
+            {"Id": "2", "Name": "Acme Corp - Upsell"},
+            {"Id": "3", "Name": "Initech - Pilot"},
+        ]
+        issues = [
+            {"key": "S-1", "summary": "Call ACME CORP", "status": "To Do", "assignee": "A"},
+            {"key": "S-2", "summary": "Unrelated task", "status": "Done", "assignee": "B"},
+        ]
+
+        rows = sync_service._merge_data(opportunities, issues)["rows"]
+
+        header, *data = rows
+        jira_key = header.index("Jira Key")
+        assert [row[jira_key] for row in data] == ["S-1", "", "", "S-2"]
+        assert data[-1][header.index("Source")] == "Jira Only"